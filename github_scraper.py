@@ -2,19 +2,36 @@
 
 import argparse
 import asyncio
+import base64
+import contextlib
 import csv
+import gzip
+import hashlib
+import heapq
+import io
 import json
+import math
+import queue
+import re
+import sqlite3
 import sys
+import threading
 import time
+import zlib
 from pathlib import Path
 from collections import defaultdict
-from typing import Any, Dict, List, Tuple
+from typing import Any, AsyncIterator, Callable, Dict, List, Set, Tuple
 
 import aiohttp
 import networkx as nx
 import os
 import time
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 # TODO: Instead of DiGraph, use MultiDiGraph everywhere?
 
 
@@ -29,6 +46,731 @@ for file in finished_file_list:
 print(finished_repo_set)
 print(len(finished_repo_set))
 
+class BloomFilter:
+    """Memory-compact set of strings with a small false positive rate.
+
+    Used as visited set when crawling networks of millions of users, where a
+    Python set of logins would need hundreds of megabytes. Membership tests can
+    return false positives (a user counts as visited although it wasn't) but
+    never false negatives.
+
+    Attributes:
+        size (int): Number of bits
+        num_hashes (int): Number of bit positions set per item
+        bits (bytearray): Bit array
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        """Size the filter for the expected number of items and error rate."""
+        self.size: int = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes: int = max(1, round(self.size / capacity * math.log(2)))
+        self.bits: bytearray = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> List[int]:
+        # Derive all positions from two 64 bit hashes (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        hash_a = int.from_bytes(digest[:8], "little")
+        hash_b = int.from_bytes(digest[8:], "little") | 1
+        return [(hash_a + i * hash_b) % self.size for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def copy(self) -> "BloomFilter":
+        """Return a snapshot of the filter that later adds don't change."""
+        bloom = BloomFilter.__new__(BloomFilter)
+        bloom.size = self.size
+        bloom.num_hashes = self.num_hashes
+        bloom.bits = bytearray(self.bits)
+        return bloom
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize filter for JSON checkpoints."""
+        return {
+            "size": self.size,
+            "num_hashes": self.num_hashes,
+            "bits": base64.b64encode(zlib.compress(bytes(self.bits))).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BloomFilter":
+        """Restore filter from a JSON checkpoint."""
+        bloom = cls.__new__(cls)
+        bloom.size = data["size"]
+        bloom.num_hashes = data["num_hashes"]
+        bloom.bits = bytearray(zlib.decompress(base64.b64decode(data["bits"])))
+        return bloom
+
+
+class Catalog:
+    """Persistent index of every file the scraper wrote, across all runs.
+
+    Stored as table ``artifacts`` in data/github_scraper_db.sqlite3 with one row
+    per file: the entity it describes (organization, "owner/repo" or empty for
+    run-wide files), the kind of data, the run directory, the time range of its
+    rows, row count, size and path relative to the data directory. Looking up
+    the latest file of an entity is an indexed query instead of a walk over all
+    run directories.
+
+    Kinds ending in ``_delta`` only hold part of an entity's data, e.g. the
+    commits of pushes seen by --watch or the divergent commits of a fork. They
+    are never returned as the latest file of an entity.
+
+    Attributes:
+        data_root (Path): Directory containing the run directories
+    """
+
+    file_name: str = "github_scraper_db.sqlite3"
+    # Kinds of per-repository files, named "{owner}_{repo}_{kind}.csv"
+    repo_kinds: List[str] = [
+        "commit_history",
+        "commit_history_delta",
+        "commit_history_fork_delta",
+        "commit_activity",
+        "contributor_activity",
+    ]
+    # Extensions of the files the scraper writes, repository names can contain dots
+    extension_pattern = re.compile(r"(\.(csv|json|gexf))?(\.(gz|zst))?$")
+
+    def __init__(self, data_root: Path) -> None:
+        """Open or create the catalog database."""
+        self.data_root = Path(data_root)
+        self.data_root.mkdir(exist_ok=True)
+        # Written to from the CSVWriter thread, read from the main thread
+        self.connection = sqlite3.connect(
+            Path(self.data_root, self.file_name), check_same_thread=False
+        )
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS artifacts (
+                path TEXT PRIMARY KEY,
+                entity TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                run TEXT NOT NULL,
+                min_time TEXT,
+                max_time TEXT,
+                rows INTEGER,
+                bytes INTEGER,
+                updated_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS artifacts_kind_entity_run
+                ON artifacts (kind, entity, run);
+            """
+        )
+
+    @staticmethod
+    def parse_file_name(file_name: str) -> Tuple[str, str]:
+        """Derive entity and kind from the name of a scraped file.
+
+        Github logins can't contain underscores, so the first underscore of a
+        per-repository file separates owner and repository name.
+
+        Args:
+            file_name (str): Name of the file, with or without compression extension
+
+        Returns:
+            Tuple[str, str]: Entity and kind
+        """
+        stem = Catalog.extension_pattern.sub("", file_name, count=1)
+        for kind in Catalog.repo_kinds:
+            if stem.endswith(f"_{kind}"):
+                owner, _, repo = stem[: -len(kind) - 1].partition("_")
+                return f"{owner}/{repo}", kind
+        if stem.endswith("_organizations"):
+            return stem[: -len("_organizations")], "organizations"
+        return "", stem
+
+    def update(
+        self,
+        path: Path,
+        rows: int = None,
+        min_time: str = None,
+        max_time: str = None,
+    ) -> None:
+        """Add or update the entry of a file."""
+        path = Path(path)
+        entity, kind = self.parse_file_name(path.name)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path.relative_to(self.data_root).as_posix(),
+                entity,
+                kind,
+                path.parent.name,
+                min_time,
+                max_time,
+                rows,
+                path.stat().st_size,
+                time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            ),
+        )
+        self.connection.commit()
+
+    def add_directory(self, directory: Path) -> None:
+        """Add files of a run directory that aren't in the catalog yet.
+
+        Sizes of files that are already known are refreshed, compressed files
+        only reach their final size when they are closed.
+        """
+        known = {
+            path for (path,) in self.connection.execute(
+                "SELECT path FROM artifacts WHERE run = ?", (Path(directory).name,)
+            )
+        }
+        for path in sorted(Path(directory).iterdir()):
+            if not path.is_file():
+                continue
+            relative_path = path.relative_to(self.data_root).as_posix()
+            if relative_path in known:
+                self.connection.execute(
+                    "UPDATE artifacts SET bytes = ? WHERE path = ?",
+                    (path.stat().st_size, relative_path),
+                )
+            else:
+                rows = None
+                if path.suffix == ".csv":
+                    # Files of runs from before the catalog existed
+                    with open(path, "r", encoding="utf-8", newline="") as file:
+                        rows = max(0, sum(1 for _ in csv.reader(file)) - 1)
+                self.update(path, rows=rows)
+        self.connection.commit()
+
+    def rebuild(self) -> int:
+        """Index all run directories, e.g. runs from before the catalog existed.
+
+        Returns:
+            int: Number of run directories
+        """
+        directories = [path for path in self.data_root.iterdir() if path.is_dir()]
+        for directory in directories:
+            self.add_directory(directory)
+        return len(directories)
+
+    def find(
+        self,
+        kind: str = None,
+        entity: str = None,
+        run: str = None,
+        latest: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Query the catalog.
+
+        Args:
+            kind (str, optional): Kind of data, e.g. "commit_history"
+            entity (str, optional): "owner/repo", or an owner to match all its repos
+            run (str, optional): Name of the run directory
+            latest (bool): Only return the most recent file of every entity and kind,
+                           without partial (``_delta``) kinds
+
+        Returns:
+            List[Dict[str, Any]]: Catalog entries, "path" is absolute
+        """
+        conditions: List[str] = []
+        parameters: List[str] = []
+        if kind:
+            conditions.append("kind = ?")
+            parameters.append(kind)
+        if entity:
+            # Range so the index is used, "0" sorts right after "/"
+            conditions.append(
+                "entity >= ? AND entity < ? AND (entity = ? OR substr(entity, ?, 1) = '/')"
+            )
+            parameters.extend([entity, f"{entity}0", entity, len(entity) + 1])
+        if run:
+            conditions.append("run = ?")
+            parameters.append(run)
+        if latest and not kind:
+            conditions.append("kind NOT LIKE '%\\_delta' ESCAPE '\\'")
+        query = "SELECT * FROM artifacts"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        if latest:
+            # SQLite takes the other columns from the row with the maximum run
+            query = query.replace("SELECT *", "SELECT *, MAX(run)")
+            query += " GROUP BY kind, entity"
+        query += " ORDER BY entity, kind, run"
+        cursor = self.connection.execute(query, parameters)
+        columns = [description[0] for description in cursor.description]
+        entries = []
+        for row in cursor:
+            entry = dict(zip(columns, row))
+            entry.pop("MAX(run)", None)
+            entry["path"] = str(Path(self.data_root, entry["path"]))
+            entries.append(entry)
+        return entries
+
+    def latest(self, kind: str, entity: str) -> List[str]:
+        """Return paths of the most recent files of a kind for an entity."""
+        return [entry["path"] for entry in self.find(kind, entity, latest=True)]
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def identity_key(value: str, key_type: str = "email") -> int:
+    """Hash a commit author's email or name the way the identity index stores it.
+
+    Emails are compared case-insensitively, names additionally ignore repeated
+    whitespace. The hash is a signed 64 bit integer, so it fits SQLite integer
+    keys and int64 columns in pandas.
+
+    Args:
+        value (str): Email or name as found in the commit
+        key_type (str): "email" or "name"
+
+    Returns:
+        int: Key of the identity, None for empty values
+    """
+    if not value or not value.strip():
+        return None
+    if key_type == "email":
+        normalized = value.strip().lower()
+    else:
+        normalized = " ".join(value.split()).casefold()
+    digest = hashlib.blake2b(
+        f"{key_type}:{normalized}".encode("utf-8"), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+class IdentityIndex:
+    """Persistent map of commit author emails and names to Github accounts.
+
+    Commits from the API carry the git author (name, email) and, if Github could
+    match it, the account (login, id). Every commit the scraper ingests adds
+    these pairs to table ``identities`` in data/github_scraper_db.sqlite3, keyed
+    by identity_key() of the email or name. Addresses like
+    ``12345+login@users.noreply.github.com`` are resolved even without an
+    account in the response. Observations are collected in memory and merged
+    into the table in batches. Table ``identity_commits`` keeps the commits
+    seen per key and account, so rescraping a repository doesn't inflate the
+    commit counts.
+
+    View ``identity_lookup`` has the most frequent account per key. Commit
+    history files carry the key of the author email in column author_key, so
+    attributing commits is a single join, e.g. with pandas::
+
+        lookup = pd.read_sql("SELECT key, login, user_id FROM identity_lookup", conn)
+        commits.merge(lookup, left_on="author_key", right_on="key", how="left")
+
+    Attributes:
+        data_root (Path): Directory containing the database
+    """
+
+    noreply_pattern = re.compile(
+        r"^(?:(\d+)\+)?([A-Za-z0-9-]+)@users\.noreply\.github\.com$", re.IGNORECASE
+    )
+    # Accounts that commit on behalf of others
+    ignored_logins: Set[str] = {"web-flow", "github-actions[bot]"}
+
+    def __init__(self, data_root: Path) -> None:
+        """Open or create the identity tables."""
+        self.data_root = Path(data_root)
+        self.connection = sqlite3.connect(
+            Path(self.data_root, Catalog.file_name), check_same_thread=False
+        )
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS identities (
+                key INTEGER NOT NULL,
+                key_type TEXT NOT NULL,
+                login TEXT NOT NULL,
+                user_id INTEGER,
+                commits INTEGER NOT NULL,
+                last_seen TEXT,
+                PRIMARY KEY (key, login)
+            );
+            CREATE TABLE IF NOT EXISTS identity_commits (
+                key INTEGER NOT NULL,
+                login TEXT NOT NULL,
+                sha INTEGER NOT NULL,
+                PRIMARY KEY (key, login, sha)
+            ) WITHOUT ROWID;
+            CREATE VIEW IF NOT EXISTS identity_lookup AS
+                SELECT key, key_type, login, user_id, MAX(commits) AS commits
+                FROM identities GROUP BY key;
+            """
+        )
+        # (key, login) -> [key_type, user_id, commit shas, last_seen]
+        self.pending: Dict[Tuple[int, str], List[Any]] = {}
+        # Commit shas in pending, the memory the batch takes
+        self.pending_shas = 0
+
+    def observe(self, commits: List[Dict[str, Any]]) -> None:
+        """Count the author and committer identities of commits from the API."""
+        for commit in commits:
+            if "commit" not in commit or not commit.get("sha"):
+                continue
+            # 64 bits identify a commit well enough and fit SQLite integers
+            sha = int.from_bytes(
+                hashlib.blake2b(commit["sha"].encode("utf-8"), digest_size=8).digest(),
+                "little",
+                signed=True,
+            )
+            for role in ("author", "committer"):
+                person = commit["commit"].get(role) or {}
+                account = commit.get(role) or {}
+                login, user_id = account.get("login"), account.get("id")
+                match = self.noreply_pattern.match(person.get("email") or "")
+                if not login and match:
+                    login = match.group(2)
+                    user_id = int(match.group(1)) if match.group(1) else None
+                if not login or login in self.ignored_logins:
+                    continue
+                for key_type in ("email", "name"):
+                    key = identity_key(person.get(key_type), key_type)
+                    if key is None:
+                        continue
+                    entry = self.pending.setdefault(
+                        (key, login), [key_type, user_id, set(), None]
+                    )
+                    entry[1] = user_id or entry[1]
+                    if sha not in entry[2]:
+                        entry[2].add(sha)
+                        self.pending_shas += 1
+                    entry[3] = max(entry[3] or "", person.get("date") or "") or None
+
+    def take_pending(self) -> Dict[Tuple[int, str], List[Any]]:
+        """Return the observations not yet written and start a new batch."""
+        pending, self.pending = self.pending, {}
+        self.pending_shas = 0
+        return pending
+
+    def write(self, pending: Dict[Tuple[int, str], List[Any]]) -> None:
+        """Merge a batch of observations into the tables."""
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO identity_commits VALUES (?, ?, ?)",
+            [
+                (key, login, sha)
+                for (key, login), (_, _, shas, _) in pending.items()
+                for sha in shas
+            ],
+        )
+        self.connection.executemany(
+            """
+            INSERT INTO identities VALUES (
+                ?1, ?2, ?3, ?4,
+                (SELECT COUNT(*) FROM identity_commits WHERE key = ?1 AND login = ?3),
+                ?5
+            )
+            ON CONFLICT (key, login) DO UPDATE SET
+                user_id = COALESCE(excluded.user_id, user_id),
+                commits = excluded.commits,
+                last_seen = MAX(COALESCE(last_seen, ''), COALESCE(excluded.last_seen, ''))
+            """,
+            [
+                (key, key_type, login, user_id, last_seen)
+                for (key, login), (key_type, user_id, _, last_seen)
+                in pending.items()
+            ],
+        )
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class CSVWriter:
+    """Write CSV files on a background thread so the event loop never waits on disk.
+
+    Rows are handed over through a queue. The writer thread drains the queue in
+    batches, groups the rows by file and keeps the files open between batches,
+    so every file gets exactly one header no matter how often rows are appended
+    to it. put() never blocks the event loop; if the disk falls more than
+    ``max_queue_size`` batches behind, new requests wait in wait() instead.
+    Errors are reported and skip the failing file or task, they never stop the
+    thread.
+
+    Attributes:
+        directory (Path): Directory the files are written to
+        compression (str): None, "gzip" or "zstd"
+        catalog (Catalog): Catalog updated with every written batch
+    """
+
+    extensions: Dict[str, str] = {"gzip": ".gz", "zstd": ".zst"}
+    # Columns used for the time range of a file in the catalog
+    time_columns: List[str] = ["commited_at", "week", "updated_at", "created_at"]
+
+    def __init__(
+        self,
+        directory: Path,
+        compression: str = None,
+        catalog: Catalog = None,
+        max_queue_size: int = 10000,
+        max_open_files: int = 256,
+    ) -> None:
+        """Start writer thread."""
+        if compression == "zstd" and zstandard is None:
+            sys.exit(
+                "zstd compression needs the zstandard package. "
+                "Install it with: python -m pip install zstandard"
+            )
+        self.directory = directory
+        self.compression = compression
+        self.catalog = catalog
+        # Rows and time range written to each file, for the catalog
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self.max_open_files = max_open_files
+        self.max_queue_size = max_queue_size
+        self.queue: queue.Queue = queue.Queue()
+        # Open files in least recently used order, reopened in append mode if evicted
+        self.files: Dict[str, Tuple[Any, csv.DictWriter]] = {}
+        self.files_with_header: Set[str] = set()
+        self.thread = threading.Thread(target=self._run, name="csv-writer")
+        self.thread.start()
+
+    def file_name(self, file_name: str) -> str:
+        """Return name of the file on disk, including the compression extension."""
+        return file_name + self.extensions.get(self.compression, "")
+
+    def put(
+        self, file_name: str, rows: List[Dict[str, Any]], columns: List[str]
+    ) -> None:
+        """Queue rows to be appended to a file."""
+        self.queue.put_nowait(("rows", (self.file_name(file_name), rows, columns)))
+
+    def submit(self, function: Callable[..., None], *args: Any) -> None:
+        """Queue a function to run on the writer thread, e.g. a database update."""
+        self.queue.put_nowait(("task", (function, args)))
+
+    async def wait(self) -> None:
+        """Wait until the writer thread has caught up with the queue."""
+        while self.queue.qsize() >= self.max_queue_size:
+            await asyncio.sleep(0.05)
+
+    def close(self) -> None:
+        """Write all queued rows, close the files and stop the thread."""
+        self.queue.put(None)
+        self.thread.join()
+
+    def _open(self, file_name: str, columns: List[str]) -> csv.DictWriter:
+        if file_name in self.files:
+            # Move to the end, the most recently used position
+            self.files[file_name] = self.files.pop(file_name)
+            return self.files[file_name][1]
+        if len(self.files) >= self.max_open_files:
+            oldest = next(iter(self.files))
+            self.files.pop(oldest)[0].close()
+        path = Path(self.directory, file_name)
+        if self.compression == "gzip":
+            file = gzip.open(path, "at", encoding="utf-8", newline="")
+        elif self.compression == "zstd":
+            # Appending starts a new zstd frame, which decompresses transparently
+            file = io.TextIOWrapper(
+                zstandard.ZstdCompressor().stream_writer(open(path, "ab")),
+                encoding="utf-8",
+                newline="",
+            )
+        else:
+            file = open(path, "a", encoding="utf-8", newline="")
+        writer = csv.DictWriter(file, fieldnames=columns, extrasaction="ignore")
+        if file_name not in self.files_with_header:
+            writer.writeheader()
+            self.files_with_header.add(file_name)
+        self.files[file_name] = (file, writer)
+        return writer
+
+    def _write(self, batch: List[Tuple[str, List[Dict[str, Any]], List[str]]]) -> None:
+        rows_per_file: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        columns_per_file: Dict[str, List[str]] = {}
+        for file_name, rows, columns in batch:
+            rows_per_file[file_name].extend(rows)
+            columns_per_file.setdefault(file_name, columns)
+        for file_name, rows in rows_per_file.items():
+            try:
+                self._open(file_name, columns_per_file[file_name]).writerows(rows)
+            except Exception as error:
+                print(f"writing {file_name} failed: {error!r}")
+                continue
+            stats = self.stats.setdefault(
+                file_name, {"rows": 0, "min_time": None, "max_time": None}
+            )
+            stats["rows"] += len(rows)
+            time_column = next(
+                (column for column in self.time_columns
+                 if column in columns_per_file[file_name]),
+                None,
+            )
+            times = [row[time_column] for row in rows if row.get(time_column)]
+            if times:
+                batch_min, batch_max = min(times), max(times)
+                stats["min_time"] = min(stats["min_time"] or batch_min, batch_min)
+                stats["max_time"] = max(stats["max_time"] or batch_max, batch_max)
+        for file, _ in self.files.values():
+            file.flush()
+        if self.catalog is not None:
+            for file_name in rows_per_file:
+                if file_name not in self.stats:
+                    continue
+                try:
+                    self.catalog.update(
+                        Path(self.directory, file_name), **self.stats[file_name]
+                    )
+                except Exception as error:
+                    # e.g. a locked database, close() adds missing files again
+                    print(f"cataloging {file_name} failed: {error!r}")
+
+    def _write_logged(
+        self, batch: List[Tuple[str, List[Dict[str, Any]], List[str]]]
+    ) -> None:
+        try:
+            self._write(batch)
+        except Exception as error:
+            print(f"writing batch failed: {error!r}")
+
+    def _run_task(self, function: Callable[..., None], args: Tuple[Any, ...]) -> None:
+        try:
+            function(*args)
+        except Exception as error:
+            print(f"writer task {function.__name__} failed: {error!r}")
+
+    def _run(self) -> None:
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            # Items are ("rows", (file_name, rows, columns)) or
+            # ("task", (function, args)), None stops the thread
+            rows: List[Tuple[str, List[Dict[str, Any]], List[str]]] = []
+            for item in batch:
+                if item is None:
+                    running = False
+                elif item[0] == "rows":
+                    rows.append(item[1])
+                else:
+                    # Tasks run after the rows queued before them are written
+                    self._write_logged(rows)
+                    rows = []
+                    self._run_task(*item[1])
+            self._write_logged(rows)
+        for file_name, (file, _) in self.files.items():
+            try:
+                file.close()
+            except Exception as error:
+                print(f"closing {file_name} failed: {error!r}")
+        self.files.clear()
+
+
+class AdaptivePacer:
+    """Adapt concurrency and spacing of requests to what GitHub sustains.
+
+    One pacer exists per token and endpoint class (core, search, stats). It
+    follows AIMD: every successful request raises the concurrency limit
+    additively by roughly one per round trip and shortens the spacing between
+    requests, while a secondary rate limit halves the concurrency, doubles the
+    spacing and pauses the pacer for the Retry-After period. Other errors, e.g.
+    missing permissions or deleted users, leave the pacer alone. Latencies well above the
+    moving average of the same endpoint indicate queueing at GitHub and shrink
+    the limit gently. When the remaining budget gets low, requests are spread
+    evenly until the rate limit resets.
+
+    Attributes:
+        limit (float): Number of requests allowed in flight
+        interval (float): Minimum seconds between the start of two requests
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 10,
+        max_limit: float = 100,
+        min_interval: float = 0.0,
+    ) -> None:
+        """Instantiate object."""
+        self.limit = initial_limit
+        self.max_limit = max_limit
+        self.min_interval = min_interval
+        self.interval = min_interval
+        self.in_flight = 0
+        self.next_start = 0.0
+        self.paused_until = 0.0
+        # Exponentially weighted moving average of the latency per endpoint
+        self.latencies: Dict[str, float] = {}
+        self.condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """Wait for a free slot and the next allowed start time."""
+        loop = asyncio.get_running_loop()
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+            start = max(loop.time(), self.next_start, self.paused_until)
+            self.next_start = start + self.interval
+        delay = start - loop.time()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                await self.release()
+                raise
+
+    async def release(self) -> None:
+        """Free the slot of a finished request."""
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def feedback(
+        self,
+        status: int,
+        headers: Any,
+        latency: float,
+        endpoint: str = "",
+        message: str = "",
+    ) -> None:
+        """Adjust limit and spacing to the response of a request.
+
+        Args:
+            status (int): HTTP status of the response
+            headers (Any): Response headers
+            latency (float): Seconds until the response headers arrived
+            endpoint (str): Endpoint of the request, latencies are compared per endpoint
+            message (str): Body of 403 and 429 responses
+        """
+        now = asyncio.get_running_loop().time()
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if status in (403, 429) and remaining == "0" and reset:
+            # Primary rate limit, nothing to do until the reset
+            self.paused_until = max(self.paused_until, now + int(reset) - time.time())
+            return
+        if status in (403, 429):
+            if "Retry-After" in headers or "secondary rate limit" in message.lower():
+                # Secondary rate limit, multiplicative decrease
+                self.limit = max(1.0, self.limit / 2)
+                self.interval = min(max(self.interval * 2, 0.25), 60)
+                retry_after = int(headers.get("Retry-After", 60))
+                self.paused_until = max(self.paused_until, now + retry_after)
+            return
+        if status >= 400:
+            # Errors say nothing about the capacity, e.g. 404 of a deleted user,
+            # and don't count as successes
+            return
+        average = self.latencies.get(endpoint, latency)
+        self.latencies[endpoint] = 0.8 * average + 0.2 * latency
+        if latency > 2 * average + 0.5:
+            self.limit = max(1.0, self.limit * 0.9)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.interval = max(self.min_interval, self.interval * 0.9)
+        limit = headers.get("X-RateLimit-Limit")
+        if remaining is not None and reset and limit:
+            # Spread the last tenth of the budget over the time until the reset
+            seconds_left = int(reset) - time.time()
+            if int(remaining) < int(limit) / 10 and seconds_left > 0:
+                self.interval = max(self.interval, seconds_left / (int(remaining) + 1))
+
+
 class GithubScraper:
     """Scrape information about organizational Github accounts.
 
@@ -40,8 +782,45 @@ class GithubScraper:
 
     Attributes:
         orgs (List[str]): List of organizational Github accounts to scrape
-        session (aiohttp.ClientSession): Session using Github user name and API token
+        session (aiohttp.ClientSession): Session shared by all API tokens
+        tokens (List[str]): Github API tokens, rotated per request
     """
+    # Columns of the per-repository commit history files
+    commit_history_columns: List[str] = [
+        "sha",
+        "committer_name",
+        "committer_email",
+        "commited_at",
+        "repository",
+        "author_login",
+        "author_id",
+        "author_key",
+    ]
+    # Columns of org_repositories.csv
+    org_repositories_columns: List[str] = [
+        "organization",
+        "name",
+        "full_name",
+        "stargazers_count",
+        "language",
+        "created_at",
+        "updated_at",
+        "homepage",
+        "fork",
+        "description",
+    ]
+    # Columns of members_info.csv
+    members_info_columns: List[str] = [
+        "organization",
+        "login",
+        "name",
+        "url",
+        "type",
+        "company",
+        "blog",
+        "location",
+    ]
+
     def get_repo_data(repo_entry):
         print(repo_entry)
         if "owner" in repo_entry:
@@ -51,20 +830,36 @@ class GithubScraper:
         
     def __init__(
         self,  
-        session_list: List[aiohttp.ClientSession],
+        session: aiohttp.ClientSession,
+        tokens: List[str],
         entities: List[str] = None,
         organizations: List[str] = [],
         repos: List[str] = None,
         members: List[str] = None,
+        fork_aware: bool = False,
+        crawl_depth: int = 2,
+        crawl_budget: int = 5000,
+        crawl_checkpoint: str = None,
+        compression: str = None,
     ) -> None:
         """Instantiate object."""
-        # TODO: implement a check to ensure sessions are still valid
-        self.session_list = session_list
-        self.num_valid_session = len(session_list)
+        self.session = session
+        self.tokens = tokens
+        # Core rate limit per token, filled in by validate_tokens()
+        self.rate_limits: Dict[str, Dict[str, int]] = {}
+        # Concurrency and pacing per token and endpoint class
+        self.pacers: Dict[Tuple[str, str], AdaptivePacer] = {}
         self.orgs = organizations
         self.counter = 0
         self.entities = entities
         self.repos = repos # this is asymmetrical! 
+        # Only scrape divergent commits of forks and deduplicate commits by sha
+        self.fork_aware = fork_aware
+        self.seen_shas: Set[str] = set()
+        # Limits of the multi-hop follower crawl
+        self.crawl_depth = crawl_depth
+        self.crawl_budget = crawl_budget
+        self.crawl_checkpoint = crawl_checkpoint
         # # map entities to orgs
         # self.entities = {entity:None for entity in entities}
         # # map orgs to repos
@@ -80,15 +875,127 @@ class GithubScraper:
             Path.cwd(), "data", time.strftime("%Y-%m-%d_%H-%M-%S")
         )
         Path(self.data_directory).mkdir()
+        # Index of all files across runs, kept current by the writer
+        self.catalog = Catalog(self.data_directory.parent)
+        # Writes CSV files off the event loop, call close() when done
+        self.writer = CSVWriter(self.data_directory, compression, self.catalog)
+        # Maps commit author emails and names to Github accounts across runs
+        self.identities = IdentityIndex(self.data_directory.parent)
     
 
     async def wait_until_next_hour(self):
         now = time.localtime().ts_min
         await asyncio.wait((60 - now) * 60)
 
-    def get_session(self) -> aiohttp.ClientSession:
+    def get_token(self) -> str:
         self.counter += 1
-        return self.session_list[self.counter % self.num_valid_session]
+        return self.tokens[self.counter % len(self.tokens)]
+
+    @contextlib.asynccontextmanager
+    async def request(
+        self, url: str, headers: Dict[str, str] = None, token: str = None
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send GET request over the shared session.
+
+        Args:
+            url (str): Github API URL
+            headers (Dict[str, str], optional): Additional request headers
+            token (str, optional): Token to authenticate with. Defaults to the next
+                                   token in rotation
+
+        Yields:
+            aiohttp.ClientResponse: Response of the API
+        """
+        if token is None:
+            token = self.get_token()
+        headers = {**(headers or {}), "Authorization": f"token {token}"}
+        pacer = self.get_pacer(token, url)
+        # Don't load more while the writer thread is behind
+        await self.writer.wait()
+        await pacer.acquire()
+        try:
+            started = time.monotonic()
+            async with self.session.get(url, headers=headers) as resp:
+                latency = time.monotonic() - started
+                # Only the message tells secondary rate limits from missing permissions
+                message = await resp.text() if resp.status in (403, 429) else ""
+                pacer.feedback(
+                    resp.status,
+                    resp.headers,
+                    latency,
+                    GithubScraper.endpoint_name(url),
+                    message,
+                )
+                if "X-RateLimit-Remaining" in resp.headers and token in self.rate_limits:
+                    if resp.headers.get("X-RateLimit-Resource", "core") == "core":
+                        self.rate_limits[token]["remaining"] = int(
+                            resp.headers["X-RateLimit-Remaining"]
+                        )
+                yield resp
+        finally:
+            await pacer.release()
+
+    @staticmethod
+    def endpoint_name(url: str) -> str:
+        """Return the endpoint of an API URL without owner, repository and user names.
+
+        E.g. repos/commits for https://api.github.com/repos/{o}/{r}/commits?page=2
+        """
+        parts = url.split("?")[0].split("api.github.com/")[-1].strip("/").split("/")
+        if parts[0] == "repos":
+            # repos/{owner}/{repo}/stats/contributors keeps the statistic
+            return "/".join(parts[:1] + parts[3:5 if parts[3:4] == ["stats"] else 4])
+        if parts[0] in ("users", "orgs"):
+            return "/".join(parts[:1] + parts[2:3])
+        return parts[0]
+
+    def get_pacer(self, token: str, url: str) -> AdaptivePacer:
+        """Return pacer of the token for the endpoint class of the URL."""
+        if "/search/" in url:
+            endpoint_class = "search"
+        elif "/stats/" in url:
+            endpoint_class = "stats"
+        else:
+            endpoint_class = "core"
+        key = (token, endpoint_class)
+        if key not in self.pacers:
+            if endpoint_class == "search":
+                # Search allows 30 requests per minute
+                self.pacers[key] = AdaptivePacer(initial_limit=2, max_limit=10, min_interval=2)
+            elif endpoint_class == "stats":
+                self.pacers[key] = AdaptivePacer(initial_limit=5, max_limit=20)
+            else:
+                self.pacers[key] = AdaptivePacer()
+        return self.pacers[key]
+
+    async def validate_tokens(self) -> None:
+        """Check all tokens concurrently and drop the ones Github rejects.
+
+        Requests to /rate_limit don't count against the rate limit. The remaining
+        core budget of each valid token is stored in self.rate_limits.
+        """
+        async def check_token(token: str) -> Tuple[str, Dict[str, Any]]:
+            try:
+                async with self.request(
+                    "https://api.github.com/rate_limit", token=token
+                ) as resp:
+                    if resp.status != 200:
+                        return token, {}
+                    return token, (await resp.json())["resources"]["core"]
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                # A token that can't be checked is treated like a rejected one
+                print(f"- token ...{token[-4:]}: check failed: {error!r}")
+                return token, {}
+
+        results = await asyncio.gather(*[check_token(token) for token in self.tokens])
+        self.tokens = [token for token, core in results if core]
+        self.rate_limits = {token: core for token, core in results if core}
+        if len(results) > len(self.tokens):
+            print(f"{len(results) - len(self.tokens)} of {len(results)} API tokens are invalid")
+        if not self.tokens:
+            sys.exit("None of the API tokens in config.json are valid.")
+        for token, core in self.rate_limits.items():
+            print(f"- token ...{token[-4:]}: {core['remaining']}/{core['limit']} requests left")
     
     async def scrape_members(self) -> Dict[str, List[str]]:
         """Get list of members of specified orgs.
@@ -140,13 +1047,15 @@ class GithubScraper:
                 pass
         return full_json
 
-    async def call_api(self, url: str, field_parser=None, resp_parser=None, callback=None, **added_fields: str) -> List[Dict[str, Any]]:
+    async def call_api(self, url: str, field_parser=None, resp_parser=None, callback=None, max_pages: int = None, **added_fields: str) -> List[Dict[str, Any]]:
         """Load json file using requests.
 
         Makes API calls and returns JSON results.
 
         Args:
             url (str): Github API URL to load as JSON
+            max_pages (int, optional): Stop after this many requests, retries of
+                                       rate-limited pages included
             **added_fields (str): Additional information that will be added to each item
                                   in the JSON data
 
@@ -157,9 +1066,8 @@ class GithubScraper:
         print(f"requesting: {url}")
         json_data: List[Dict[str, Any]] = []
         # Requesting user info doesn't support pagination and returns dict, not list
-        session = self.get_session()
         if url.split("/")[-2] == "users" or url.split("/")[-3] == "repos":
-            async with session.get(f"{url}?per_page=100") as resp:
+            async with self.request(f"{url}?per_page=100") as resp:
                 member_json: Dict[str, Any] = await resp.json()
                 # if "documentation_url" in member_json:
                 #     sys.exit(member_json['message'])
@@ -168,30 +1076,37 @@ class GithubScraper:
                 json_data.append(member_json)
             return json_data
         # Other API calls return lists and should paginate
+        # URLs may carry their own query, e.g. commits?sha=...
+        separator = "&" if "?" in url else "?"
+        requests_made = 0
         while True:
-            print(f"requesting: {url}?per_page=100&page={str(page)}")
-
-            async with session.get(f"{url}?per_page=100&page={str(page)}") as resp:
+            requests_made += 1
+            print(f"requesting: {url}{separator}per_page=100&page={str(page)}")
+            # Token rotates per page, so long paginations are spread over all tokens
+            async with self.request(f"{url}{separator}per_page=100&page={str(page)}") as resp:
                 json_page: List[Dict[str, Any]] = await resp.json()
                 if json_page == []:
                     break
                 #  if secondary-rate limited
                 if isinstance(json_page, dict) and "documentation_url" in json_page and "message" in json_page:
+                    # The pacer of the token backs off, the retry waits for it or
+                    # goes to the next token
                     if "rate limit exceeded" in json_page["message"]:
-                        print(f"rate limit exceeded, waiting unti l next hour on': {url}?per_page=100&page={str(page)}")
-                        # TODO: this may cause deadlocks...should reason through it?
-                        self.wait_until_next_hour()
+                        print(f"rate limit exceeded, retrying: {url}{separator}per_page=100&page={str(page)}")
                     elif "secondary rate" in json_page["message"]:
-                        print(f"secondary rate limit exceeded, waiting 2 minutes on': {url}?per_page=100&page={str(page)}")
-                        await asyncio.sleep(60 * 2)
+                        print(f"secondary rate limit exceeded, retrying: {url}{separator}per_page=100&page={str(page)}")
                     elif "empty" in json_page["message"]:
-                        print(f"{url}?per_page=100&page={str(page)} is empty")
+                        print(f"{url}{separator}per_page=100&page={str(page)} is empty")
                         break
                     else:
-                        print(f"{url}?per_page=100&page={str(page)} returned an error: {json_page['message']}")
+                        # e.g. a deleted or renamed user, retrying won't help
+                        print(f"{url}{separator}per_page=100&page={str(page)} returned an error: {json_page['message']}")
+                        break
+                    if max_pages and requests_made >= max_pages:
+                        break
                     continue
                 # if not isinstance(json_page, list):
-                #     raise Exception(f"query: {url}?per_page=100&page={str(page)} returned {(type(json_page))}")
+                #     raise Exception(f"query: {url}{separator}per_page=100&page={str(page)} returned {(type(json_page))}")
                 if callable(resp_parser):
                     json_page = resp_parser(json_page)
                 parsed_json_page = []
@@ -209,6 +1124,8 @@ class GithubScraper:
                 json_data.extend(parsed_json_page)
                 if len(parsed_json_page) < 100:
                     break
+                if max_pages and requests_made >= max_pages:
+                    break
                 page += 1
         if callable(callback):
             callback(added_fields, json_data)
@@ -225,14 +1142,57 @@ class GithubScraper:
             columns_list (List): List of columns that represent relevant fields
                                  in the JSON data
         """
-        with open(Path(self.data_directory, file_name), "a+", encoding="utf-8") as file:
-            csv_file = csv.DictWriter(
-                file, fieldnames=columns_list, extrasaction="ignore"
-            )
-            csv_file.writeheader()
-            for item in json_list:
-                csv_file.writerow(item)
-        print(f"- file saved as {Path('data', self.data_directory.name, file_name)}")
+        self.writer.put(file_name, json_list, columns_list)
+        print(
+            f"- {len(json_list)} rows queued for "
+            f"{Path('data', self.data_directory.name, self.writer.file_name(file_name))}"
+        )
+
+    def close(self) -> None:
+        """Finish writing all files and add the remaining ones to the catalog."""
+        self.writer.close()
+        self.catalog.add_directory(self.data_directory)
+        self.catalog.close()
+        self.identities.write(self.identities.take_pending())
+        self.identities.close()
+
+    async def call_stats_api(
+        self, url: str, max_attempts: int = 8, initial_delay: float = 2.0
+    ) -> Any:
+        """Load a repository statistics endpoint, re-polling while GitHub computes it.
+
+        The statistics endpoints answer with 202 Accepted while the data is being
+        generated in the background. Instead of blocking, the request is
+        rescheduled with exponential backoff; ``asyncio.sleep`` hands control back
+        to the event loop so the other in-flight requests keep running.
+
+        Args:
+            url (str): Github statistics API URL
+            max_attempts (int): Number of polls before giving up on the endpoint
+            initial_delay (float): Seconds to wait before the first re-poll
+
+        Returns:
+            Any: JSON returned by the API, an empty list for empty repositories or
+                 None if the statistics could not be loaded
+        """
+        delay = initial_delay
+        for attempt in range(1, max_attempts + 1):
+            async with self.request(url) as resp:
+                if resp.status == 202:
+                    print(f"{url} is being computed, re-polling in {delay:.0f}s")
+                elif resp.status == 204:
+                    # Empty repository, nothing to compute
+                    return []
+                elif resp.status != 200:
+                    print(f"{url} returned status {resp.status}")
+                    return None
+                else:
+                    return await resp.json()
+            if attempt < max_attempts:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60)
+        print(f"{url} still computing after {max_attempts} attempts, skipping")
+        return None
 
 
     async def find_organizations_for_entity(self, entity=None):
@@ -320,68 +1280,333 @@ class GithubScraper:
 
     async def create_org_repo_csv(self) -> None:
         """Write a CSV file with information about orgs' repositories."""
-        # Create list of items that should appear as columns in the CSV
-        table_columns: List[str] = [
-            "organization",
-            "name",
-            "full_name",
-            "stargazers_count",
-            "language",
-            "created_at",
-            "updated_at",
-            "homepage",
-            "fork",
-            "description",
-        ]
         # no callapi here because it's handled in main as a dependency check
-        self.generate_csv("org_repositories.csv", self.repos, table_columns)
+        self.generate_csv(
+            "org_repositories.csv", self.repos, GithubScraper.org_repositories_columns
+        )
+
+    def commit_history_field_parser(item: Dict[str, Any]):
+        try:
+            item["sha"] = item["sha"]
+            item["committer_name"] = item["commit"]["author"]["name"]
+            item["committer_email"] = item["commit"]["author"]["email"]
+            item["commited_at"] = item["commit"]["author"]["date"]
+            item["organization"] = item["organization"]
+            item["repository"] = item["repository"]
+            # Github account, if Github matched the author email to one
+            item["author_login"] = (item.get("author") or {}).get("login")
+            item["author_id"] = (item.get("author") or {}).get("id")
+            item["author_key"] = identity_key(item["committer_email"])
+        except Exception:
+            print(item)
+        return item
 
     async def scrape_repo_commit_history(self) -> None:
         """Create list of commits to the organizations' repositories."""
         print("Scraping commit history")
         json_commits_all = []
-        table_columns: List[str] = [
-            "sha",
-            "committer_name",
-            "committer_email",
-            "commited_at",
-            "repository",
-        ]
-
-        def repo_commit_history_field_parser(item: Dict[str, Any]):
-            try:
-                item["sha"] = item["sha"]
-                item["committer_name"] = item["commit"]["author"]["name"]
-                item["committer_email"] = item["commit"]["author"]["email"]
-                item["commited_at"] = item["commit"]["author"]["date"]
-                item["organization"] = item["organization"]
-                item["repository"] = item["repository"]
-            except Exception:
-                print(item)
-            return item
+        table_columns: List[str] = GithubScraper.commit_history_columns
+        repo_commit_history_field_parser = GithubScraper.commit_history_field_parser
 
         tasks: List[asyncio.Task[Any]] = []
 
-        def save_commit_callback(metadata, json_data: List[Dict[str, Any]]) -> None:
-            self.generate_csv(f"{metadata['organization']}_{metadata['repository']}_commit_history.csv", json_data, table_columns)
+        def save_commit_callback(
+            metadata, json_data: List[Dict[str, Any]], kind: str = "commit_history"
+        ) -> None:
+            if self.fork_aware:
+                json_data = self.filter_seen_commits(json_data)
+            self.record_identities(json_data)
+            self.generate_csv(f"{metadata['organization']}_{metadata['repository']}_{kind}.csv", json_data, table_columns)
 
-        
+        def fetch_commit_history(org_name: str, repo_name: str) -> asyncio.Task[Any]:
+            url = f"https://api.github.com/repos/{org_name}/{repo_name}/commits"
+            return asyncio.create_task(
+                self.call_api(url, field_parser=repo_commit_history_field_parser, callback=save_commit_callback,
+                                organization=org_name, repository=repo_name)
+            )
+
+        # Forks are only scraped for their divergent commits in fork-aware mode
+        forks: List[Tuple[str, str]] = []
         for repo in self.repos:
             org_name, repo_name = GithubScraper.get_repo_data(repo)
             if (org_name, repo_name) in finished_repo_set:
                 print("skpping: ", org_name, repo_name, "already scraped")
                 continue
-            url = f"https://api.github.com/repos/{org_name}/{repo_name}/commits"
-            tasks.append(
-                asyncio.create_task(
-                    self.call_api(url, field_parser=repo_commit_history_field_parser, callback=save_commit_callback,
-                                    organization=org_name, repository=repo_name)
+            if self.fork_aware and str(repo.get("fork")).lower() == "true":
+                forks.append((org_name, repo_name))
+                continue
+            tasks.append(fetch_commit_history(org_name, repo_name))
+        if forks:
+            # Fetch each parent's full history once, unless it is scraped anyway
+            scraped = set(map(GithubScraper.get_repo_data, self.repos))
+            fork_parents = await self.resolve_fork_parents(forks)
+            resolved = {(fork["organization"], fork["repository"]) for fork in fork_parents}
+            for org_name, repo_name in forks:
+                if (org_name, repo_name) not in resolved:
+                    # Without a parent to compare with, scrape the fork like any repo
+                    tasks.append(fetch_commit_history(org_name, repo_name))
+            for parent in {(fork["parent_organization"], fork["parent_repository"])
+                           for fork in fork_parents}:
+                if parent not in scraped and parent not in finished_repo_set:
+                    scraped.add(parent)
+                    tasks.append(fetch_commit_history(*parent))
+
+            async def fetch_divergent_commits(fork: Dict[str, Any]) -> List[Dict[str, Any]]:
+                commits = await self.call_compare_api(
+                    fork["organization"],
+                    fork["repository"],
+                    f"{fork['parent_organization']}:{fork['parent_branch']}",
+                    f"{fork['organization']}:{fork['branch']}",
                 )
+                if commits is None:
+                    print(
+                        f"could not compare fork {fork['organization']}/"
+                        f"{fork['repository']}, scraping its full history"
+                    )
+                    return await fetch_commit_history(fork["organization"], fork["repository"])
+                for commit in commits:
+                    commit["organization"] = fork["organization"]
+                    commit["repository"] = fork["repository"]
+                    repo_commit_history_field_parser(commit)
+                # Only the commits that aren't in the parent
+                save_commit_callback(fork, commits, "commit_history_fork_delta")
+                return commits
+
+            for fork in fork_parents:
+                tasks.append(asyncio.create_task(fetch_divergent_commits(fork)))
+            self.generate_csv(
+                "fork_parents.csv",
+                fork_parents,
+                [
+                    "organization",
+                    "repository",
+                    "branch",
+                    "parent_organization",
+                    "parent_repository",
+                    "parent_branch",
+                ],
             )
         json_commits_all = await self.load_json(tasks)
         # every repo generats it's own commit history file. Ideal solution is to use a db
         # self.generate_csv("commit_history.csv", json_commits_all, table_columns)
 
+    async def resolve_fork_parents(self, forks: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Look up the parent repository and default branches of forks.
+
+        Repository listings only carry the ``fork`` flag, the parent is only part
+        of the full repository object.
+
+        Args:
+            forks (List[Tuple[str, str]]): Owner and name of each fork
+
+        Returns:
+            List[Dict[str, Any]]: One entry per fork with its parent and branches,
+                                  forks whose parent couldn't be resolved are missing
+        """
+        results = await asyncio.gather(
+            *[
+                self.call_api(f"https://api.github.com/repos/{org_name}/{repo_name}")
+                for org_name, repo_name in forks
+            ],
+            return_exceptions=True,
+        )
+        fork_parents: List[Dict[str, Any]] = []
+        for (org_name, repo_name), result in zip(forks, results):
+            repo_json = result[0] if isinstance(result, list) and result else {}
+            if "parent" not in repo_json:
+                print(f"could not find parent of fork {org_name}/{repo_name}")
+                continue
+            fork_parents.append({
+                # Names as listed, so the caller can tell which forks were resolved
+                "organization": org_name,
+                "repository": repo_name,
+                "branch": repo_json["default_branch"],
+                "parent_organization": repo_json["parent"]["owner"]["login"],
+                "parent_repository": repo_json["parent"]["name"],
+                "parent_branch": repo_json["parent"]["default_branch"],
+            })
+        return fork_parents
+
+    async def call_compare_api(
+        self, org_name: str, repo_name: str, base: str, head: str
+    ) -> List[Dict[str, Any]]:
+        """Get the commits reachable from head but not from base.
+
+        Args:
+            org_name (str): Owner of the repository to compare in
+            repo_name (str): Name of the repository to compare in
+            base (str): Base ref, may be prefixed with another owner ("owner:branch")
+            head (str): Head ref, may be prefixed with another owner ("owner:branch")
+
+        Returns:
+            List[Dict[str, Any]]: Commits in the same format as the commits endpoint,
+                                  None if the refs could not be compared completely
+        """
+        url = f"https://api.github.com/repos/{org_name}/{repo_name}/compare/{base}...{head}"
+        page: int = 1
+        commits: List[Dict[str, Any]] = []
+        while True:
+            print(f"requesting: {url}?per_page=100&page={str(page)}")
+            async with self.request(f"{url}?per_page=100&page={str(page)}") as resp:
+                try:
+                    json_page: Dict[str, Any] = await resp.json(content_type=None)
+                except ValueError:
+                    # e.g. an HTML error page of a gateway
+                    json_page = None
+            message = json_page.get("message", "") if isinstance(json_page, dict) else ""
+            if resp.status in (403, 429) and "rate limit" in message:
+                # The pacer of the token backs off, the retry waits for it or
+                # goes to the next token
+                print(f"rate limit exceeded, retrying: {url}?per_page=100&page={str(page)}")
+                continue
+            if resp.status != 200 or not isinstance(json_page, dict) or "commits" not in json_page:
+                # A partial list would look like a complete comparison
+                print(f"{url} returned an error: {resp.status} {message}")
+                return None
+            commits.extend(json_page["commits"])
+            if len(json_page["commits"]) < 100:
+                break
+            page += 1
+        return commits
+
+    def record_identities(self, commits: List[Dict[str, Any]]) -> None:
+        """Add commit authors to the identity index, written by the writer thread."""
+        self.identities.observe(commits)
+        # Few authors can still collect millions of shas, flush on those
+        if self.identities.pending_shas >= 100_000:
+            self.writer.submit(self.identities.write, self.identities.take_pending())
+
+    def filter_seen_commits(self, json_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop commits whose sha was already stored during this run."""
+        new_commits: List[Dict[str, Any]] = []
+        for commit in json_data:
+            if commit.get("sha") in self.seen_shas:
+                continue
+            self.seen_shas.add(commit.get("sha"))
+            new_commits.append(commit)
+        return new_commits
+
+    async def scrape_repo_commit_summary(self) -> None:
+        """Create weekly commit activity and contributor totals for each repository.
+
+        Uses the repository statistics endpoints instead of paging through every
+        commit, so a repository costs three requests regardless of its size:
+
+        - /stats/commit_activity: commits per week for the last year
+        - /stats/participation: owner share of the weekly commit counts
+        - /stats/contributors: per-contributor weekly additions, deletions, commits
+        """
+        print("Scraping commit summaries")
+        activity_columns: List[str] = [
+            "organization",
+            "repository",
+            "week",
+            "commits",
+            "owner_commits",
+        ]
+        contributor_columns: List[str] = [
+            "organization",
+            "repository",
+            "login",
+            "week",
+            "additions",
+            "deletions",
+            "commits",
+        ]
+        totals_columns: List[str] = [
+            "organization",
+            "repository",
+            "login",
+            "total",
+        ]
+        # Repositories whose statistics could not be loaded, instead of empty files
+        failures: List[Dict[str, str]] = []
+
+        def week_date(timestamp: int) -> str:
+            return time.strftime("%Y-%m-%d", time.gmtime(timestamp))
+
+        async def summarize_repo(org_name: str, repo_name: str) -> List[Dict[str, Any]]:
+            base_url = f"https://api.github.com/repos/{org_name}/{repo_name}/stats"
+            activity, participation, contributors = await asyncio.gather(
+                self.call_stats_api(f"{base_url}/commit_activity"),
+                self.call_stats_api(f"{base_url}/participation"),
+                self.call_stats_api(f"{base_url}/contributors"),
+            )
+            for endpoint, data in (
+                ("commit_activity", activity),
+                ("participation", participation),
+                ("contributors", contributors),
+            ):
+                if data is None:
+                    failures.append({
+                        "organization": org_name,
+                        "repository": repo_name,
+                        "endpoint": endpoint,
+                    })
+            # Both endpoints cover the same 52 weeks, oldest first
+            owner_weeks = (participation or {}).get("owner", [])
+            activity_rows = []
+            for index, week in enumerate(activity or []):
+                activity_rows.append({
+                    "organization": org_name,
+                    "repository": repo_name,
+                    "week": week_date(week["week"]),
+                    "commits": week["total"],
+                    "owner_commits": owner_weeks[index]
+                    if len(owner_weeks) == len(activity) else "",
+                })
+            if activity is not None:
+                self.generate_csv(
+                    f"{org_name}_{repo_name}_commit_activity.csv",
+                    activity_rows,
+                    activity_columns,
+                )
+            if contributors is None:
+                return []
+            contributor_rows = []
+            totals = []
+            for contributor in contributors:
+                # Contributors can be null for deleted accounts
+                login = (contributor.get("author") or {}).get("login", "")
+                totals.append({
+                    "organization": org_name,
+                    "repository": repo_name,
+                    "login": login,
+                    "total": contributor["total"],
+                })
+                for week in contributor["weeks"]:
+                    if not week["c"]:
+                        continue
+                    contributor_rows.append({
+                        "organization": org_name,
+                        "repository": repo_name,
+                        "login": login,
+                        "week": week_date(week["w"]),
+                        "additions": week["a"],
+                        "deletions": week["d"],
+                        "commits": week["c"],
+                    })
+            self.generate_csv(
+                f"{org_name}_{repo_name}_contributor_activity.csv",
+                contributor_rows,
+                contributor_columns,
+            )
+            return totals
+
+        tasks: List[asyncio.Task[Any]] = []
+        for repo in self.repos:
+            org_name, repo_name = GithubScraper.get_repo_data(repo)
+            tasks.append(asyncio.create_task(summarize_repo(org_name, repo_name)))
+        json_totals_all = await self.load_json(tasks)
+        self.generate_csv("contributor_totals.csv", json_totals_all, totals_columns)
+        if failures:
+            print(f"Statistics of {len(failures)} endpoints could not be loaded")
+            self.generate_csv(
+                "commit_summary_failures.csv",
+                failures,
+                ["organization", "repository", "endpoint"],
+            )
+
     async def scrape_repo_contributors(self) -> None:
         """Create list of contributors to the organizations' repositories."""
         print("Scraping contributors")
@@ -450,23 +1675,15 @@ class GithubScraper:
     async def scrape_members_info(self) -> None:
         """Gather information about the organizations' members."""
         print("Getting user information of all members.")
-        table_columns: List[str] = [
-            "organization",
-            "login",
-            "name",
-            "url",
-            "type",
-            "company",
-            "blog",
-            "location",
-        ]
         tasks: List[asyncio.Task[Any]] = []
         for org in self.orgs:
             for member in self.members[org]:
                 url = f"https://api.github.com/users/{member}"
                 tasks.append(asyncio.create_task(self.call_api(url, organization=org)))
         json_members_info: List[Dict[str, Any]] = await self.load_json(tasks)
-        self.generate_csv("members_info.csv", json_members_info, table_columns)
+        self.generate_csv(
+            "members_info.csv", json_members_info, GithubScraper.members_info_columns
+        )
 
     async def scrape_starred_repos(self) -> None:
         """Create list of all the repositories starred by organizations' members."""
@@ -538,6 +1755,8 @@ class GithubScraper:
                 )
         json_followers = await self.load_json(tasks_followers)
         json_following = await self.load_json(tasks_following)
+        # Sets for constant time membership checks while building the graphs
+        member_sets = {org: set(members) for org, members in self.members.items()}
         # Build full and narrow graphs
         for follower in json_followers:
             graph_full.add_edge(
@@ -545,7 +1764,7 @@ class GithubScraper:
                 follower["follows"],
                 organization=follower["original_org"],
             )
-            if follower["login"] in self.members[follower["original_org"]]:
+            if follower["login"] in member_sets[follower["original_org"]]:
                 graph_narrow.add_edge(
                     follower["login"],
                     follower["follows"],
@@ -557,7 +1776,7 @@ class GithubScraper:
                 following["login"],
                 organization=following["original_org"],
             )
-            if following["login"] in self.members[following["original_org"]]:
+            if following["login"] in member_sets[following["original_org"]]:
                 graph_narrow.add_edge(
                     following["followed_by"],
                     following["login"],
@@ -575,6 +1794,185 @@ class GithubScraper:
             "full-follower-network.gexf and narrow-follower-network.gexf"
         )
 
+    async def crawl_follower_network(
+        self, batch_size: int = 20, max_pages: int = 3, checkpoint_interval: float = 60
+    ) -> None:
+        """Crawl the follower network several hops out from the seed users.
+
+        Seeds are the members of the organizations and, if repositories were
+        loaded, their contributors. Users are expanded (followers and following)
+        in order of priority: members of the scraped organizations first, then
+        users that were discovered most often, i.e. with the highest degree in the
+        crawled graph. The crawl stops at the depth limit or when the request
+        budget is used up.
+
+        Expanded users are tracked in a Bloom filter, so the visited set stays a
+        few bytes per user. Edges are appended to crawl_edges.csv after every
+        batch and the frontier is checkpointed periodically by the writer thread,
+        so an interrupted crawl can be resumed with --crawl-checkpoint.
+
+        Args:
+            batch_size (int): Number of users expanded concurrently
+            max_pages (int): Pages of followers and following loaded per user
+            checkpoint_interval (float): Seconds between checkpoints
+        """
+        print(
+            f"Crawling follower network, {self.crawl_depth} hops, "
+            f"budget {self.crawl_budget} requests"
+        )
+        checkpoint_path = Path(
+            self.crawl_checkpoint or Path(self.data_directory, "crawl_checkpoint.json")
+        )
+        member_orgs: Dict[str, str] = {
+            member: org for org in self.members for member in self.members[org]
+        }
+        # Frontier: login -> [depth, degree], ordered by heap of (-priority, depth, login)
+        frontier: Dict[str, List[int]] = {}
+        heap: List[Tuple[int, int, str]] = []
+        requests_used = 0
+        if checkpoint_path.exists():
+            print(f"Resuming crawl from {checkpoint_path}")
+            with open(checkpoint_path, "r", encoding="utf-8") as file:
+                checkpoint = json.load(file)
+            visited = BloomFilter.from_dict(checkpoint["visited"])
+            requests_used = checkpoint["requests_used"]
+            for login, depth, degree in checkpoint["frontier"]:
+                frontier[sys.intern(login)] = [depth, degree]
+        else:
+            # Every request returns at most 100 new users
+            visited = BloomFilter(max(100_000, self.crawl_budget * 100))
+            seeds = list(member_orgs)
+            if self.repos:
+                start_counter = self.counter
+                tasks: List[asyncio.Task[Any]] = []
+                for repo in self.repos:
+                    org_name, repo_name = GithubScraper.get_repo_data(repo)
+                    url = f"https://api.github.com/repos/{org_name}/{repo_name}/contributors"
+                    tasks.append(asyncio.create_task(self.call_api(url, max_pages=max_pages)))
+                seeds.extend(
+                    contributor["login"] for contributor in await self.load_json(tasks)
+                    if "login" in contributor
+                )
+                requests_used += self.counter - start_counter
+            for login in seeds:
+                frontier[sys.intern(login)] = [0, 0]
+
+        def priority(login: str) -> int:
+            # Affiliated users always go before the rest of the frontier
+            return frontier[login][1] + (1_000_000 if login in member_orgs else 0)
+
+        def rebuild_heap() -> None:
+            heap[:] = [
+                (-priority(login), depth, login)
+                for login, (depth, _) in frontier.items()
+            ]
+            heapq.heapify(heap)
+
+        rebuild_heap()
+
+        def write_checkpoint(state: Dict[str, Any], snapshot: BloomFilter) -> None:
+            state["visited"] = snapshot.to_dict()
+            temporary_path = checkpoint_path.with_name(checkpoint_path.name + ".tmp")
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                json.dump(state, file)
+            # An interrupted write must not destroy the previous checkpoint
+            os.replace(temporary_path, checkpoint_path)
+
+        def save_checkpoint() -> None:
+            # Snapshot on the loop, serialize on the writer thread, which also
+            # writes the edges of the batches before
+            self.writer.submit(
+                write_checkpoint,
+                {
+                    "requests_used": requests_used,
+                    "frontier": [
+                        [login, depth, degree]
+                        for login, (depth, degree) in frontier.items()
+                    ],
+                },
+                visited.copy(),
+            )
+
+        async def expand(login: str, depth: int) -> List[Dict[str, Any]]:
+            followers, following = await asyncio.gather(
+                self.call_api(
+                    f"https://api.github.com/users/{login}/followers", max_pages=max_pages
+                ),
+                self.call_api(
+                    f"https://api.github.com/users/{login}/following", max_pages=max_pages
+                ),
+            )
+            edges = [
+                {"source": user["login"], "target": login, "depth": depth + 1}
+                for user in followers if "login" in user
+            ]
+            edges.extend(
+                {"source": login, "target": user["login"], "depth": depth + 1}
+                for user in following if "login" in user
+            )
+            return edges
+
+        edge_columns: List[str] = ["source", "target", "depth"]
+        node_columns: List[str] = ["login", "depth", "degree", "organization"]
+        expanded = 0
+        last_checkpoint = time.monotonic()
+        while heap:
+            # Every expansion costs at least two requests, at most 2 * max_pages
+            remaining = self.crawl_budget - requests_used
+            batch: List[Tuple[str, int]] = []
+            while heap and len(batch) < min(batch_size, remaining // (2 * max_pages)):
+                neg_priority, depth, login = heapq.heappop(heap)
+                # Skip stale heap entries whose priority has since increased
+                if login not in frontier or -neg_priority != priority(login):
+                    continue
+                del frontier[login]
+                if login in visited:
+                    continue
+                visited.add(login)
+                batch.append((login, depth))
+            if not batch:
+                break
+            start_counter = self.counter
+            results = await asyncio.gather(*[expand(login, depth) for login, depth in batch])
+            requests_used += self.counter - start_counter
+            expanded += len(batch)
+            edges = [edge for result in results for edge in result]
+            for edge in edges:
+                for login in (edge["source"], edge["target"]):
+                    if edge["depth"] >= self.crawl_depth or login in visited:
+                        continue
+                    login = sys.intern(login)
+                    entry = frontier.setdefault(login, [edge["depth"], 0])
+                    entry[0] = min(entry[0], edge["depth"])
+                    entry[1] += 1
+                    heapq.heappush(heap, (-priority(login), entry[0], login))
+            # Every degree increase pushes an entry, drop the stale ones once they
+            # outnumber the frontier
+            if len(heap) > 2 * len(frontier) + batch_size:
+                rebuild_heap()
+            self.generate_csv("crawl_edges.csv", edges, edge_columns)
+            self.generate_csv(
+                "crawl_nodes.csv",
+                [
+                    {
+                        "login": login,
+                        "depth": depth,
+                        "degree": len(result),
+                        "organization": member_orgs.get(login, ""),
+                    }
+                    for (login, depth), result in zip(batch, results)
+                ],
+                node_columns,
+            )
+            if time.monotonic() - last_checkpoint >= checkpoint_interval:
+                save_checkpoint()
+                last_checkpoint = time.monotonic()
+        save_checkpoint()
+        print(
+            f"Crawl finished: expanded {expanded} users with {requests_used} requests, "
+            f"{len(frontier)} users left in the frontier"
+        )
+
     async def generate_memberships_network(self) -> None:
         """Take all the members of the organizations and generate a directed graph.
 
@@ -605,6 +2003,456 @@ class GithubScraper:
             f"{Path('data', self.data_directory.name, 'membership_network.gexf')}"
         )
 
+    async def probe_count(self, url: str) -> int:
+        """Count the items of a paginated endpoint with a single request.
+
+        Requests one item per page, so the page number of the ``last`` link in
+        the Link header equals the number of items.
+
+        Args:
+            url (str): Github API URL of a paginated list
+
+        Returns:
+            int: Number of items, 0 if the endpoint returned an error
+        """
+        async with self.request(f"{url}?per_page=1") as resp:
+            if resp.status != 200:
+                return 0
+            if "last" in resp.links:
+                return int(resp.links["last"]["url"].query["page"])
+            return len(await resp.json())
+
+    async def plan_requests(
+        self, methods: List[str], requests_per_second: float = 10
+    ) -> Dict[str, Any]:
+        """Estimate the requests and time a scrape needs without running it.
+
+        Lists members and repositories (needed by any scrape) and probes the size
+        of every paginated list the selected methods would load: commit and
+        contributor counts via the Link header of per_page=1 requests, follower,
+        following and repository counts from the user objects. Estimates are
+        written to plan.json together with a suggested split of the
+        repositories and members across the tokens.
+
+        Args:
+            methods (List[str]): Names of the scrape methods to plan for
+            requests_per_second (float): Assumed sustained throughput per token
+
+        Returns:
+            Dict[str, Any]: The plan written to plan.json
+        """
+        print("Planning requests")
+        start_counter = self.counter
+        repo_methods = {
+            "create_org_repo_csv",
+            "scrape_repo_contributors",
+            "scrape_repo_commit_history",
+            "scrape_repo_commit_summary",
+        }
+        member_methods = {
+            "scrape_members_repos",
+            "scrape_members_info",
+            "scrape_starred_repos",
+            "generate_follower_network",
+            "generate_memberships_network",
+            "crawl_follower_network",
+        }
+
+        def pages(count: int) -> int:
+            # call_api stops at the first page with less than 100 items
+            return count // 100 + 1
+
+        # Cost of each repository and member, the units that are sharded
+        costs: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        setup_requests = 0
+        if repo_methods & set(methods) and not self.repos:
+            before = self.counter
+            self.repos = await self.init_repos()
+            setup_requests += self.counter - before
+        if member_methods & set(methods) and not self.members:
+            before = self.counter
+            self.members = await self.scrape_members()
+            setup_requests += self.counter - before
+
+        async def probe_repo(org_name: str, repo_name: str) -> None:
+            base_url = f"https://api.github.com/repos/{org_name}/{repo_name}"
+            repo_costs = costs[f"{org_name}/{repo_name}"]
+            if "scrape_repo_commit_history" in methods:
+                repo_costs["scrape_repo_commit_history"] = pages(
+                    await self.probe_count(f"{base_url}/commits")
+                )
+            if "scrape_repo_contributors" in methods:
+                repo_costs["scrape_repo_contributors"] = pages(
+                    await self.probe_count(f"{base_url}/contributors")
+                )
+            if "scrape_repo_commit_summary" in methods:
+                repo_costs["scrape_repo_commit_summary"] = 3
+
+        async def probe_member(member: str) -> None:
+            member_costs = costs[member]
+            user = (await self.call_api(f"https://api.github.com/users/{member}"))[0]
+            if "scrape_members_repos" in methods:
+                member_costs["scrape_members_repos"] = pages(user.get("public_repos", 0))
+            if "scrape_members_info" in methods:
+                member_costs["scrape_members_info"] = 1
+            if "generate_follower_network" in methods:
+                member_costs["generate_follower_network"] = pages(
+                    user.get("followers", 0)
+                ) + pages(user.get("following", 0))
+            if "generate_memberships_network" in methods:
+                member_costs["generate_memberships_network"] = 1
+            if "scrape_starred_repos" in methods:
+                member_costs["scrape_starred_repos"] = pages(
+                    await self.probe_count(f"https://api.github.com/users/{member}/starred")
+                )
+
+        units: List[str] = []
+        tasks: List[asyncio.Task[Any]] = []
+        if repo_methods & set(methods):
+            for repo in self.repos:
+                org_name, repo_name = GithubScraper.get_repo_data(repo)
+                units.append(f"{org_name}/{repo_name}")
+                tasks.append(asyncio.create_task(probe_repo(org_name, repo_name)))
+        if member_methods & set(methods):
+            for member in {member for org in self.members for member in self.members[org]}:
+                units.append(member)
+                tasks.append(asyncio.create_task(probe_member(member)))
+        # Units whose probe failed are missing from the estimate
+        failed_probes: Dict[str, str] = {
+            unit: f"{type(result).__name__}: {result}"
+            for unit, result in zip(units, await asyncio.gather(*tasks, return_exceptions=True))
+            if isinstance(result, Exception)
+        }
+        for unit in failed_probes:
+            costs.pop(unit, None)
+
+        method_requests: Dict[str, int] = defaultdict(int)
+        for unit_costs in costs.values():
+            for method, cost in unit_costs.items():
+                method_requests[method] += cost
+        if "crawl_follower_network" in methods:
+            method_requests["crawl_follower_network"] = self.crawl_budget
+        total_requests = setup_requests + sum(method_requests.values())
+
+        # Waiting for rate limit resets dominates once the budget is exhausted
+        remaining = sum(core["remaining"] for core in self.rate_limits.values())
+        hourly_limit = sum(core["limit"] for core in self.rate_limits.values())
+        # Apps and enterprise tokens have higher limits than the 5000 of users
+        limit_per_token = hourly_limit / len(self.rate_limits) if self.rate_limits else 5000
+        seconds = total_requests / (requests_per_second * len(self.tokens))
+        if total_requests > remaining and hourly_limit:
+            next_reset = min(core["reset"] for core in self.rate_limits.values())
+            windows = math.ceil((total_requests - remaining) / hourly_limit)
+            seconds = max(seconds, next_reset - time.time() + (windows - 1) * 3600)
+
+        # Largest units first to the token with the most budget left, shards are
+        # in the order of the tokens in config.json
+        shards: List[Dict[str, Any]] = [
+            {"token": f"...{token[-4:]}",
+             "budget": self.rate_limits.get(token, {}).get("remaining", 0),
+             "requests": 0,
+             "units": []}
+            for token in self.tokens
+        ]
+        for unit, unit_costs in sorted(
+            costs.items(), key=lambda item: sum(item[1].values()), reverse=True
+        ):
+            shard = max(shards, key=lambda s: s["budget"] - s["requests"])
+            shard["requests"] += sum(unit_costs.values())
+            shard["units"].append(unit)
+
+        plan: Dict[str, Any] = {
+            "methods": methods,
+            "requests_per_method": dict(method_requests),
+            "setup_requests": setup_requests,
+            "total_requests": total_requests,
+            "probe_requests": self.counter - start_counter,
+            "remaining_budget": remaining,
+            "hourly_budget": hourly_limit,
+            "estimated_hours": round(seconds / 3600, 2),
+            "tokens_needed_for_one_hour": math.ceil(total_requests / limit_per_token),
+            "shards": shards,
+            "failed_probes": failed_probes,
+        }
+        with open(Path(self.data_directory, "plan.json"), "w", encoding="utf-8") as file:
+            json.dump(plan, file, indent=2)
+        for method, requests in sorted(method_requests.items()):
+            print(f"- {method}: {requests} requests")
+        print(
+            f"Total: {total_requests} requests, {remaining} left on "
+            f"{len(self.tokens)} tokens ({hourly_limit} per hour). "
+            f"Estimated time: {seconds / 60:.0f} minutes."
+        )
+        for index, shard in enumerate(shards):
+            print(
+                f"- token {index} ({shard['token']}): {len(shard['units'])} "
+                f"repositories/members, {shard['requests']} requests of "
+                f"{shard['budget']} left"
+            )
+        if failed_probes:
+            print(
+                f"{len(failed_probes)} repositories/members could not be probed "
+                "and are missing from the estimate, see failed_probes in plan.json"
+            )
+        print(f"- plan saved as {Path('data', self.data_directory.name, 'plan.json')}")
+        return plan
+
+    async def watch(self, default_interval: int = 60, num_workers: int = 4) -> None:
+        """Poll event feeds and only rescrape what changed.
+
+        Polls /orgs/{org}/events for every organization, or /repos/{o}/{r}/events
+        when repositories were loaded directly. Requests are conditional on the
+        ETag of the previous response, so quiet feeds answer with 304 Not
+        Modified, which does not count against the rate limit. Feeds are polled no
+        faster than GitHub's X-Poll-Interval header allows.
+
+        New events are turned into refresh jobs:
+
+        - PushEvent: fetch the pushed commit range into the repository's commit history
+        - OrganizationEvent (member_added), MembershipEvent (added to a team):
+          refresh the member; OrganizationEvent (member_removed): drop the member
+        - MemberEvent: record the change of a repository's collaborators
+        - CreateEvent (repository), ForkEvent, PublicEvent, RepositoryEvent:
+          refresh the repository record; for forks that is the forked repository
+
+        Refreshed data only covers what changed, so it is written to files
+        ending in ``_delta`` (e.g. ``{owner}_{repo}_commit_history_delta.csv``),
+        which the catalog doesn't mistake for complete scrapes.
+
+        Feeds keep the last 300 events, further pages are requested until the
+        newest event of the previous poll is reached.
+
+        Args:
+            default_interval (int): Seconds between polls if GitHub sends no interval
+            num_workers (int): Number of jobs processed concurrently
+        """
+        if self.orgs:
+            feeds = [f"https://api.github.com/orgs/{org}/events" for org in self.orgs]
+        elif self.repos:
+            feeds = [
+                "https://api.github.com/repos/{}/{}/events".format(
+                    *GithubScraper.get_repo_data(repo)
+                )
+                for repo in self.repos
+            ]
+        else:
+            raise ValueError("No organizations or repositories to watch")
+        print(f"Watching {len(feeds)} event feeds, press Ctrl+C to stop")
+        jobs: asyncio.Queue = asyncio.Queue()
+        # Jobs waiting in the queue, so bursts of events only refresh once
+        pending: Set[Tuple[str, ...]] = set()
+
+        def schedule(job: Tuple[str, ...]) -> None:
+            if job not in pending:
+                pending.add(job)
+                jobs.put_nowait(job)
+
+        async def poll(url: str) -> None:
+            # Keep one token per feed, ETags are only valid for the same token
+            token = self.get_token()
+            etag = None
+            last_event_id = None
+            while True:
+                headers = {"If-None-Match": etag} if etag else {}
+                interval = default_interval
+                events: List[Dict[str, Any]] = []
+                page = 1
+                try:
+                    while True:
+                        async with self.request(
+                            f"{url}?per_page=100&page={page}", headers=headers, token=token
+                        ) as resp:
+                            if page == 1:
+                                interval = max(
+                                    default_interval,
+                                    int(resp.headers.get("X-Poll-Interval", 0)),
+                                )
+                            if resp.status != 200:
+                                if resp.status != 304:
+                                    print(f"{url} returned status {resp.status}")
+                                break
+                            if page == 1:
+                                etag = resp.headers.get("ETag")
+                            events_page: List[Dict[str, Any]] = await resp.json()
+                        events.extend(events_page)
+                        # Busy feeds have more new events than one page, page back to
+                        # the last seen one, but no further than the 300 GitHub keeps
+                        if (
+                            last_event_id is None
+                            or len(events_page) < 100
+                            or page >= 3
+                            or min(int(event["id"]) for event in events_page) <= last_event_id
+                        ):
+                            break
+                        page += 1
+                        headers = {}
+                    new_events = [
+                        event for event in events
+                        if last_event_id is None or int(event["id"]) > last_event_id
+                    ]
+                    if events:
+                        newest = max(int(event["id"]) for event in events)
+                        # The first response only sets the baseline, it was scraped already
+                        if last_event_id is not None:
+                            for event in sorted(new_events, key=lambda e: int(e["id"])):
+                                try:
+                                    jobs_of_event = self.event_to_jobs(event)
+                                except (KeyError, TypeError, AttributeError) as error:
+                                    print(f"skipping malformed event {event.get('id')}: {error!r}")
+                                    continue
+                                for job in jobs_of_event:
+                                    schedule(job)
+                        last_event_id = max(newest, last_event_id or 0)
+                except Exception as error:
+                    # Timeouts, unexpected bodies etc. must not stop the daemon
+                    print(f"polling {url} failed: {error!r}")
+                await asyncio.sleep(interval)
+
+        async def work() -> None:
+            while True:
+                job = await jobs.get()
+                pending.discard(job)
+                try:
+                    await self.run_watch_job(job)
+                except Exception as error:
+                    print(f"refresh job {job} failed: {error}")
+                jobs.task_done()
+
+        await asyncio.gather(
+            *[poll(url) for url in feeds], *[work() for _ in range(num_workers)]
+        )
+
+    def event_to_jobs(self, event: Dict[str, Any]) -> List[Tuple[str, ...]]:
+        """Map a GitHub event to the refresh jobs it requires.
+
+        Args:
+            event (Dict[str, Any]): Event as returned by the events API
+
+        Returns:
+            List[Tuple[str, ...]]: Jobs, first element is the job type
+        """
+        event_type = event["type"]
+        payload = event.get("payload", {})
+        org_name, _, repo_name = event["repo"]["name"].partition("/")
+        if "org" in event:
+            org_name = event["org"]["login"]
+        if event_type == "PushEvent":
+            return [(
+                "commits",
+                org_name,
+                repo_name,
+                payload.get("ref", ""),
+                payload["before"],
+                payload["head"],
+            )]
+        action = payload.get("action", "")
+        if event_type == "MemberEvent":
+            # Collaborators of a repository, not members of the organization
+            return [(
+                "collaborator", org_name, repo_name, payload["member"]["login"], action
+            )]
+        if event_type == "MembershipEvent" and action == "added":
+            # Team members are members of the organization
+            return [("member", org_name, payload["member"]["login"])]
+        if event_type == "OrganizationEvent" and "membership" in payload:
+            login = payload["membership"]["user"]["login"]
+            if action == "member_added":
+                return [("member", org_name, login)]
+            if action == "member_removed":
+                return [("member_removed", org_name, login)]
+        if event_type == "CreateEvent" and payload.get("ref_type") != "repository":
+            # New branches and tags arrive with their PushEvent
+            return []
+        if event_type in ("CreateEvent", "ForkEvent", "PublicEvent", "RepositoryEvent"):
+            # ForkEvents refresh the forked repository, its fork count changed
+            return [("repository", org_name, repo_name)]
+        return []
+
+    async def run_watch_job(self, job: Tuple[str, ...]) -> None:
+        """Refresh the repositories, members or commits affected by an event."""
+        job_type, org_name = job[0], job[1]
+        print(f"refreshing {' '.join(job[:3])}")
+        if job_type == "commits":
+            _, _, repo_name, ref, before, head = job
+            branch = ref.split("refs/heads/", 1)[-1]
+            if set(before) == {"0"}:
+                # New branch, compare against the default branch instead
+                repo_json = (await self.call_api(
+                    f"https://api.github.com/repos/{org_name}/{repo_name}"
+                ))[0]
+                before = repo_json.get("default_branch")
+                if before == branch:
+                    # The default branch itself was created, e.g. in a new repository
+                    before = None
+            commits = None
+            if before:
+                commits = await self.call_compare_api(org_name, repo_name, before, head)
+            if commits is None:
+                # No base to compare against, take the whole history of the head
+                commits = await self.call_api(
+                    f"https://api.github.com/repos/{org_name}/{repo_name}/commits?sha={head}"
+                )
+                commits = [commit for commit in commits if "sha" in commit]
+            for commit in commits:
+                commit["organization"] = org_name
+                commit["repository"] = repo_name
+                GithubScraper.commit_history_field_parser(commit)
+            commits = self.filter_seen_commits(commits)
+            self.record_identities(commits)
+            self.generate_csv(
+                f"{org_name}_{repo_name}_commit_history_delta.csv",
+                commits,
+                GithubScraper.commit_history_columns,
+            )
+        elif job_type == "member":
+            login = job[2]
+            members_info = await self.call_api(
+                f"https://api.github.com/users/{login}", organization=org_name
+            )
+            org_members = self.members.setdefault(org_name, [])
+            if login not in org_members:
+                org_members.append(login)
+            self.generate_csv(
+                "members_info_delta.csv",
+                members_info,
+                GithubScraper.members_info_columns,
+            )
+        elif job_type == "member_removed":
+            login = job[2]
+            if login in self.members.get(org_name, []):
+                self.members[org_name].remove(login)
+            self.generate_csv(
+                "members_removed_delta.csv",
+                [{"organization": org_name, "login": login}],
+                ["organization", "login"],
+            )
+        elif job_type == "collaborator":
+            _, _, repo_name, login, action = job
+            self.generate_csv(
+                "repo_collaborators_delta.csv",
+                [{
+                    "organization": org_name,
+                    "repository": repo_name,
+                    "login": login,
+                    "action": action,
+                }],
+                ["organization", "repository", "login", "action"],
+            )
+        elif job_type == "repository":
+            repo_name = job[2]
+            repos = await self.call_api(
+                f"https://api.github.com/repos/{org_name}/{repo_name}",
+                organization=org_name,
+            )
+            if "name" not in repos[0]:
+                print(f"{org_name}/{repo_name} is not accessible")
+                return
+            self.generate_csv(
+                "org_repositories_delta.csv",
+                repos,
+                GithubScraper.org_repositories_columns,
+            )
+
 
 def read_config() -> List[Tuple[str, str]]:
     """Read config file.
@@ -619,6 +2467,8 @@ def read_config() -> List[Tuple[str, str]]:
         with open(Path(Path.cwd(), "config.json"), "r", encoding="utf-8") as file:
             auth_list = []
             config = json.load(file)
+            if isinstance(config, dict):
+                config = [config]
             if isinstance(config, list):
                 for elem in config:
                     user: str = elem["user_name"]
@@ -634,6 +2484,27 @@ def read_config() -> List[Tuple[str, str]]:
             "Please add them to the config.json file."
         )
 
+def create_session(num_tokens: int) -> aiohttp.ClientSession:
+    """Create the HTTP session shared by all API tokens.
+
+    All requests go to api.github.com, so a single connection pool with
+    keep-alive and cached DNS lookups serves every token. Tokens are sent
+    per request in the Authorization header instead of per session.
+
+    Args:
+        num_tokens (int): Number of API tokens, scales the connection limit
+
+    Returns:
+        aiohttp.ClientSession: Session to pass to GithubScraper
+    """
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=min(100, 20 * num_tokens),
+        ttl_dns_cache=600,
+        keepalive_timeout=60,
+    )
+    return aiohttp.ClientSession(connector=connector)
+
 def read_entities(filename: str = None) -> List[str]:
     """Read list of organizations from file.
 
@@ -759,6 +2630,22 @@ def parse_args() -> Dict[str, bool]:
         dest="scrape_repo_commit_history",
         help="scrape the commit history of all of the organizations' repositories (CSV)",
     )
+    argparser.add_argument(
+        "--fork-aware",
+        "-fa",
+        action="store_true",
+        dest="fork_aware",
+        help="with --commit-history, scrape each fork's parent once and only the "
+        "commits of the fork that diverge from it",
+    )
+    argparser.add_argument(
+        "--commit-summary",
+        "-cs",
+        action="store_true",
+        dest="scrape_repo_commit_summary",
+        help="scrape weekly commit activity and contributor totals of the "
+        "organizations' repositories from the statistics API (CSV)",
+    )
     argparser.add_argument(
         "--contributors",
         "-c",
@@ -803,6 +2690,63 @@ def parse_args() -> Dict[str, bool]:
         dest="generate_memberships_network",
         help="scrape all organizational memberships of org members (GEXF)",
     )
+    argparser.add_argument(
+        "--crawl",
+        "-cr",
+        action="store_true",
+        dest="crawl_follower_network",
+        help="crawl the follower network several hops out from the members of the "
+        "organizations and contributors of the repositories (CSV)",
+    )
+    argparser.add_argument(
+        "--crawl-depth",
+        type=int,
+        default=2,
+        help="number of hops from the seed users when crawling (default: 2)",
+    )
+    argparser.add_argument(
+        "--crawl-budget",
+        type=int,
+        default=5000,
+        help="maximum number of API requests of a crawl (default: 5000)",
+    )
+    argparser.add_argument(
+        "--crawl-checkpoint",
+        help="JSON file to save the crawl frontier to and resume it from",
+    )
+    argparser.add_argument(
+        "--plan",
+        "-p",
+        action="store_true",
+        help="don't scrape, estimate the number of requests and time the selected "
+        "options need and how to split them across the API tokens (JSON)",
+    )
+    argparser.add_argument(
+        "--catalog",
+        nargs="?",
+        const="",
+        metavar="KIND[:ENTITY]",
+        help="don't scrape, list the latest files of every entity from the catalog "
+        "of all runs, optionally filtered by kind (e.g. commit_history) and "
+        "organization or owner/repo",
+    )
+    argparser.add_argument(
+        "--catalog-rebuild",
+        action="store_true",
+        help="add the files of all existing run directories to the catalog",
+    )
+    argparser.add_argument(
+        "--compression",
+        choices=["gzip", "zstd"],
+        help="compress the CSV files (zstd needs the zstandard package)",
+    )
+    argparser.add_argument(
+        "--watch",
+        "-w",
+        action="store_true",
+        help="keep running after the scrape and rescrape only the repositories, "
+        "members and commits that changed according to the events API",
+    )
     argparser.add_argument(
         "--entity_organizations",
         "-eo",
@@ -816,7 +2760,35 @@ def parse_args() -> Dict[str, bool]:
 async def main() -> None:
     """Set up GithubScraper object."""
     args: Dict[str, bool] = parse_args()
-    if not any(args.values()):
+    catalog_query = args.pop("catalog")
+    catalog_rebuild = args.pop("catalog_rebuild")
+    if catalog_query is not None or catalog_rebuild:
+        # Catalog lookups need neither API tokens nor a new run directory
+        catalog = Catalog(Path(Path.cwd(), "data"))
+        if catalog_rebuild:
+            print(f"Indexed {catalog.rebuild()} run directories")
+        if catalog_query is not None:
+            kind, _, entity = catalog_query.partition(":")
+            for entry in catalog.find(kind or None, entity or None, latest=True):
+                print(
+                    f"{entry['run']}\t{entry['kind']}\t{entry['entity']}\t"
+                    f"{entry['rows'] if entry['rows'] is not None else ''}\t"
+                    f"{entry['min_time'] or ''}\t{entry['max_time'] or ''}\t"
+                    f"{entry['path']}"
+                )
+        catalog.close()
+        return
+    # Options that modify how the scrapers run rather than naming one of them
+    options = {
+        "fork_aware": args.pop("fork_aware"),
+        "crawl_depth": args.pop("crawl_depth"),
+        "crawl_budget": args.pop("crawl_budget"),
+        "crawl_checkpoint": args.pop("crawl_checkpoint"),
+        "compression": args.pop("compression"),
+    }
+    watch = args.pop("watch")
+    plan = args.pop("plan")
+    if not any(args.values()) and not watch:
         sys.exit(
             "You need to provide at least one argument. "
             "For usage, call: github_scraper -h"
@@ -831,47 +2803,66 @@ async def main() -> None:
         "scrape_starred_repos",
         "generate_follower_network",
         "generate_memberships_network",
+        "crawl_follower_network",
     ]
-    require_repos = ["create_org_repo_csv", "scrape_repo_contributors", "scrape_repo_commit_history"]
-    # Start aiohttp session
-    session_list = []
-    for creds in auth_list:
-        # safety check on username, token done earlier
-        auth = aiohttp.BasicAuth(creds[0], creds[1])
-        session_list.append(aiohttp.ClientSession(auth=auth))
-    print(args)
-    if args["load_entities"]:
-        entities = read_entities(args["load_entities"])
-        github_scraper = GithubScraper(session_list, entities=entities)
-    elif args["load_organizations"]:
-        organizations = read_organizations(args["load_organizations"])
-        github_scraper = GithubScraper(session_list, organizations=organizations)
-    elif args["load_repositories"]:
-        repos = read_repos(args["load_repositories"])
-        print(repos)
-        github_scraper = GithubScraper(session_list, repos=repos)
-    else:
-        github_scraper = GithubScraper(session_list)
-    # If --all was provided, simply run everything
-    if args["all"]:
-        github_scraper.members = await github_scraper.scrape_members()
-        github_scraper.repos = await github_scraper.init_repos()
-        for arg in args:
-            if arg != "all" and arg != "find_organizations_for_entity":
-                await getattr(github_scraper, arg)()
-    else:
-        # Check args provided, get members/repos if necessary, call related methods
-        called_args = [arg for arg, value in args.items() if value]
-
-        if any(arg for arg in called_args if arg in require_members):
-            github_scraper.members = await github_scraper.members()
-        if any(arg for arg in called_args if arg in require_repos) and not github_scraper.repos:
-            github_scraper.repos = await github_scraper.init_repos()
-        for arg in called_args:
-            if args[arg] is True and hasattr(github_scraper, arg): # boolean, meaning no argument
-                await getattr(github_scraper, arg)()
-            elif args[arg] and  hasattr(github_scraper, arg): # truthy, meaning there's an argument
-                    await getattr(github_scraper, arg)(args[arg])
+    require_repos = [
+        "create_org_repo_csv",
+        "scrape_repo_contributors",
+        "scrape_repo_commit_history",
+        "scrape_repo_commit_summary",
+    ]
+    # One session and connection pool for all tokens, closed when done
+    tokens = [api_token for _, api_token in auth_list]
+    async with create_session(len(tokens)) as session:
+        print(args)
+        if args["load_entities"]:
+            entities = read_entities(args["load_entities"])
+            github_scraper = GithubScraper(session, tokens, entities=entities, **options)
+        elif args["load_organizations"]:
+            organizations = read_organizations(args["load_organizations"])
+            github_scraper = GithubScraper(session, tokens, organizations=organizations, **options)
+        elif args["load_repositories"]:
+            repos = read_repos(args["load_repositories"])
+            print(repos)
+            github_scraper = GithubScraper(session, tokens, repos=repos, **options)
+        else:
+            github_scraper = GithubScraper(session, tokens, **options)
+        try:
+            await github_scraper.validate_tokens()
+            if plan:
+                methods = [
+                    arg for arg, value in args.items()
+                    if (value is True or (args["all"] and value is False))
+                    and arg != "all" and hasattr(github_scraper, arg)
+                ]
+                await github_scraper.plan_requests(methods)
+                return
+            # If --all was provided, simply run everything
+            if args["all"]:
+                github_scraper.members = await github_scraper.scrape_members()
+                github_scraper.repos = await github_scraper.init_repos()
+                for arg in args:
+                    if arg != "all" and arg != "find_organizations_for_entity":
+                        await getattr(github_scraper, arg)()
+            else:
+                # Check args provided, get members/repos if necessary, call related methods
+                called_args = [arg for arg, value in args.items() if value]
+
+                if any(arg for arg in called_args if arg in require_members):
+                    github_scraper.members = await github_scraper.scrape_members()
+                if any(arg for arg in called_args if arg in require_repos) and not github_scraper.repos:
+                    github_scraper.repos = await github_scraper.init_repos()
+                for arg in called_args:
+                    if args[arg] is True and hasattr(github_scraper, arg): # boolean, meaning no argument
+                        await getattr(github_scraper, arg)()
+                    elif args[arg] and  hasattr(github_scraper, arg): # truthy, meaning there's an argument
+                            await getattr(github_scraper, arg)(args[arg])
+            if watch:
+                if not github_scraper.orgs and not github_scraper.repos:
+                    github_scraper.repos = await github_scraper.init_repos()
+                await github_scraper.watch()
+        finally:
+            github_scraper.close()
 
 
 if __name__ == "__main__":